@@ -1,16 +1,22 @@
 """Traffic data analyzer module."""
 
+import heapq
 from datetime import datetime
 from typing import List, Tuple, Dict
-from collections import defaultdict
+from collections import defaultdict, deque
+
+from .sorting import Records
 
 
 class TrafficAnalyzer:
     """Analyzes traffic data and computes various statistics."""
     
-    def __init__(self, records: List[Tuple[datetime, int]]):
+    def __init__(self, records: Records):
         """
         Initialize analyzer with traffic records.
+        
+        Every statistic is computed in a single pass, so records may also be
+        a RecordFile that streams from disk.
         """
         self.records = records
     
@@ -37,12 +43,9 @@ class TrafficAnalyzer:
         """
         Find top N half-hour periods with most cars.
         """
-        # Sort by count (descending), then by timestamp (for stability)
-        sorted_records = sorted(
-            self.records,
-            key=lambda x: (-x[1], x[0])
-        )
-        return sorted_records[:n]
+        # Order by count (descending), then by timestamp (for stability),
+        # keeping only the best n while scanning
+        return heapq.nsmallest(n, self.records, key=lambda x: (-x[1], x[0]))
     
     def get_min_contiguous_period(self, window_size: int = 3) -> Tuple[List[Tuple[datetime, int]], int]:
         """
@@ -56,13 +59,17 @@ class TrafficAnalyzer:
         min_total = float('inf')
         min_window = []
         
-        # Sliding window approach
-        for i in range(len(self.records) - window_size + 1):
-            window = self.records[i:i + window_size]
-            window_total = sum(count for _, count in window)
+        # Sliding window approach with a running total
+        window = deque(maxlen=window_size)
+        window_total = 0
+        for record in self.records:
+            if len(window) == window_size:
+                window_total -= window[0][1]
+            window.append(record)
+            window_total += record[1]
             
-            if window_total < min_total:
+            if len(window) == window_size and window_total < min_total:
                 min_total = window_total
-                min_window = window
+                min_window = list(window)
         
         return min_window, min_total
@@ -0,0 +1,162 @@
+"""Anomaly detection module."""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from itertools import islice
+from operator import itemgetter
+from typing import Deque, Dict, List
+
+from .sorting import Records, is_sorted
+
+
+# Interval between consecutive counter readings
+HALF_HOUR = timedelta(minutes=30)
+
+
+@dataclass(frozen=True)
+class Anomaly:
+    """A flagged interval in the half-hour series."""
+
+    kind: str
+    start: datetime
+    end: datetime
+    detail: str
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Convert anomaly to a JSON-serializable dictionary.
+        """
+        return {
+            'kind': self.kind,
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'detail': self.detail,
+        }
+
+
+class AnomalyDetector:
+    """Flags counters that look broken: zero runs, spikes and missing slots."""
+
+    def __init__(self, records: Records):
+        """
+        Initialize detector with traffic records.
+
+        Ordered records (e.g. a RecordFile from external_sort) are used as
+        they are, so each check streams over them; others are sorted first.
+        """
+        if is_sorted(records):
+            self.records = records
+        else:
+            self.records = sorted(records, key=itemgetter(0))
+
+    def find_zero_runs(self, min_length: int = 3) -> List[Anomaly]:
+        """
+        Find runs of at least min_length contiguous half hours with zero cars.
+        """
+        anomalies = []
+        run_start = run_end = None
+        run_length = 0
+
+        for timestamp, count in self.records:
+            if count == 0 and run_length and timestamp - run_end == HALF_HOUR:
+                run_end = timestamp
+                run_length += 1
+                continue
+
+            if run_length >= min_length:
+                anomalies.append(self._zero_run(run_start, run_end, run_length))
+
+            if count == 0:
+                run_start = run_end = timestamp
+                run_length = 1
+            else:
+                run_length = 0
+
+        if run_length >= min_length:
+            anomalies.append(self._zero_run(run_start, run_end, run_length))
+
+        return anomalies
+
+    @staticmethod
+    def _zero_run(start: datetime, end: datetime, length: int) -> Anomaly:
+        return Anomaly('zero_run', start, end, f"zero-count half hours: {length}")
+
+    def find_spikes(
+        self,
+        window: int = 7,
+        threshold: float = 3.0,
+        min_history: int = 3
+    ) -> List[Anomaly]:
+        """
+        Find counts far above the rolling mean for the same time of day.
+
+        Each time-of-day slot keeps its last `window` counts with running
+        sums, so the mean and variance update in O(1) per record. A record
+        is flagged when it lies more than `threshold` standard deviations
+        above the mean of at least `min_history` earlier counts.
+        """
+        if min_history < 2:
+            raise ValueError(f"Minimum history must be at least 2: {min_history}")
+        if window < min_history:
+            raise ValueError(
+                f"Window ({window}) must be at least the minimum history ({min_history})"
+            )
+
+        history: Dict[time, Deque[int]] = defaultdict(deque)
+        sums: Dict[time, int] = defaultdict(int)
+        sums_sq: Dict[time, int] = defaultdict(int)
+        anomalies = []
+
+        for timestamp, count in self.records:
+            slot = timestamp.time()
+            past = history[slot]
+            n = len(past)
+
+            if n >= min_history:
+                total = sums[slot]
+                mean = total / n
+                # Exact integer numerator, so the variance is never negative
+                variance = (n * sums_sq[slot] - total * total) / (n * (n - 1))
+                # Floor at one car so a flat history doesn't flag tiny changes
+                std = max(variance ** 0.5, 1.0)
+
+                if count - mean > threshold * std:
+                    anomalies.append(Anomaly(
+                        'spike', timestamp, timestamp,
+                        f"{count} cars vs rolling mean {mean:.1f} (std {std:.1f})"
+                    ))
+
+            past.append(count)
+            sums[slot] += count
+            sums_sq[slot] += count * count
+            if n == window:
+                dropped = past.popleft()
+                sums[slot] -= dropped
+                sums_sq[slot] -= dropped * dropped
+
+        return anomalies
+
+    def find_gaps(self) -> List[Anomaly]:
+        """
+        Find missing half hours between consecutive records.
+        """
+        anomalies = []
+
+        for (previous, _), (current, _) in zip(self.records, islice(self.records, 1, None)):
+            if current - previous > HALF_HOUR:
+                missing = (current - previous) // HALF_HOUR - 1
+                if missing:
+                    anomalies.append(Anomaly(
+                        'gap', previous + HALF_HOUR, current - HALF_HOUR,
+                        f"missing half hours: {missing}"
+                    ))
+
+        return anomalies
+
+    def detect(self) -> List[Anomaly]:
+        """
+        Run all checks with default settings, ordered by start time.
+        """
+        anomalies = self.find_zero_runs() + self.find_spikes() + self.find_gaps()
+        return sorted(anomalies, key=lambda anomaly: (anomaly.start, anomaly.kind))
@@ -1,51 +1,192 @@
 """Output formatter module."""
 
+import io
+import json
 from datetime import datetime
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, TextIO
+
+from .anomaly import Anomaly
+from .parser import ParseSummary
+
+
+SEPARATOR = "=" * 60
+
+# Output is collected and handed to the stream in chunks of about this size
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class ReportWriter:
+    """
+    Writes report sections straight to a text stream.
+
+    Lines are buffered and flushed to the stream in large writes, so a report
+    never has to be held in memory as a whole. Sections can be written as
+    soon as their results are available.
+    """
+
+    def __init__(self, stream: TextIO, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initialize writer for the given output stream.
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._chunks: List[str] = []
+        self._pending = 0
+        self._stream_failed = False
+
+    def __enter__(self) -> 'ReportWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Sections already produced are still written if a later one fails;
+        # only a failed write to the stream itself (e.g. a closed pipe)
+        # skips the flush
+        if not self._stream_failed:
+            self.flush()
+
+    def write_line(self, line: str = "") -> None:
+        """
+        Buffer a single output line, flushing when the buffer is full.
+        """
+        self._chunks.append(line)
+        self._chunks.append("\n")
+        self._pending += len(line) + 1
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered lines to the stream.
+        """
+        try:
+            if self._chunks:
+                self.stream.write(''.join(self._chunks))
+                self._chunks = []
+                self._pending = 0
+            self.stream.flush()
+        except OSError:
+            self._stream_failed = True
+            raise
+
+    def write_header(self, title: str) -> None:
+        """
+        Write a section header framed by separator lines.
+        """
+        self.write_line(SEPARATOR)
+        self.write_line(title)
+        self.write_line(SEPARATOR)
+
+    def write_total_cars(self, total_cars: int) -> None:
+        """
+        Write the total cars section.
+        """
+        self.write_header("TOTAL CARS")
+        self.write_line(str(total_cars))
+        self.write_line()
+
+    def write_daily_totals(self, daily_totals: Dict[str, int]) -> None:
+        """
+        Write the daily totals section.
+        """
+        self.write_header("DAILY TOTALS")
+        for date, count in daily_totals.items():
+            self.write_line(f"{date} {count}")
+        self.write_line()
+
+    def write_top_half_hours(self, top_half_hours: List[Tuple[datetime, int]]) -> None:
+        """
+        Write the top half hours section.
+        """
+        self.write_header("TOP 3 HALF HOURS WITH MOST CARS")
+        for timestamp, count in top_half_hours:
+            self.write_line(f"{timestamp.isoformat()} {count}")
+        self.write_line()
+
+    def write_min_period(self, min_period: Tuple[List[Tuple[datetime, int]], int]) -> None:
+        """
+        Write the minimum 1.5 hour period section.
+        """
+        self.write_header("MINIMUM 1.5 HOUR PERIOD (3 CONTIGUOUS HALF HOURS)")
+        min_records, total = min_period
+        for timestamp, count in min_records:
+            self.write_line(f"{timestamp.isoformat()} {count}")
+        self.write_line()
+        self.write_line(f"Total cars in this period: {total}")
+
+    def write_anomalies(self, anomalies: List[Anomaly]) -> None:
+        """
+        Write the anomalies section.
+        """
+        self.write_line()
+        self.write_header("ANOMALIES")
+        if not anomalies:
+            self.write_line("None detected")
+        for anomaly in anomalies:
+            self.write_line(
+                f"{anomaly.kind} {anomaly.start.isoformat()} "
+                f"{anomaly.end.isoformat()} {anomaly.detail}"
+            )
+
+    def write_parse_summary(self, summary: ParseSummary) -> None:
+        """
+        Write the parse errors section for lenient parsing.
+        """
+        self.write_line()
+        self.write_header("PARSE ERRORS")
+        self.write_line(f"Valid records: {summary.records}")
+        self.write_line(f"Invalid lines: {summary.errors}")
+        self.write_line(f"Duplicate timestamps dropped: {summary.duplicates}")
+        self.write_line(f"Error rate: {summary.error_rate:.2%}")
+
+
+def write_results(
+    stream: TextIO,
+    total_cars: int,
+    daily_totals: Dict[str, int],
+    top_half_hours: List[Tuple[datetime, int]],
+    min_period: Tuple[List[Tuple[datetime, int]], int],
+    parse_summary: Optional[ParseSummary] = None,
+    anomalies: Optional[List[Anomaly]] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> None:
+    """
+    Write analysis results to a stream, terminated by a newline.
+    """
+    with ReportWriter(stream, buffer_size) as writer:
+        writer.write_total_cars(total_cars)
+        writer.write_daily_totals(daily_totals)
+        writer.write_top_half_hours(top_half_hours)
+        writer.write_min_period(min_period)
+        if anomalies is not None:
+            writer.write_anomalies(anomalies)
+        if parse_summary is not None:
+            writer.write_parse_summary(parse_summary)
 
 
 def format_results(
     total_cars: int,
     daily_totals: Dict[str, int],
     top_half_hours: List[Tuple[datetime, int]],
-    min_period: Tuple[List[Tuple[datetime, int]], int]
+    min_period: Tuple[List[Tuple[datetime, int]], int],
+    parse_summary: Optional[ParseSummary] = None,
+    anomalies: Optional[List[Anomaly]] = None
 ) -> str:
     """
     Format analysis results according to specification.
     """
-    lines = []
-    
-    # Total cars
-    lines.append("=" * 60)
-    lines.append("TOTAL CARS")
-    lines.append("=" * 60)
-    lines.append(str(total_cars))
-    lines.append("")
-    
-    # Daily totals
-    lines.append("=" * 60)
-    lines.append("DAILY TOTALS")
-    lines.append("=" * 60)
-    for date, count in daily_totals.items():
-        lines.append(f"{date} {count}")
-    lines.append("")
-    
-    # Top 3 half hours
-    lines.append("=" * 60)
-    lines.append("TOP 3 HALF HOURS WITH MOST CARS")
-    lines.append("=" * 60)
-    for timestamp, count in top_half_hours:
-        lines.append(f"{timestamp.isoformat()} {count}")
-    lines.append("")
-    
-    # Minimum 1.5 hour period
-    lines.append("=" * 60)
-    lines.append("MINIMUM 1.5 HOUR PERIOD (3 CONTIGUOUS HALF HOURS)")
-    lines.append("=" * 60)
-    min_records, total = min_period
-    for timestamp, count in min_records:
-        lines.append(f"{timestamp.isoformat()} {count}")
-    lines.append(f"\nTotal cars in this period: {total}")
-    
-    return '\n'.join(lines)
+    output = io.StringIO()
+    write_results(
+        output, total_cars, daily_totals, top_half_hours, min_period,
+        parse_summary, anomalies
+    )
 
+    # Drop the trailing newline the streaming writer terminates with
+    return output.getvalue()[:-1]
+
+
+def write_anomalies_json(stream: TextIO, anomalies: List[Anomaly]) -> None:
+    """
+    Write anomalies to a stream as a JSON array.
+    """
+    json.dump([anomaly.to_dict() for anomaly in anomalies], stream, indent=2)
+    stream.write("\n")
@@ -5,12 +5,16 @@ Reads traffic data from file and makes analys reports
 """
 
 import argparse
+import os
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
-from .parser import parse_traffic_file
+from .parser import load_traffic_file
+from .sorting import DEFAULT_RUN_SIZE
 from .analyzer import TrafficAnalyzer
-from .formatter import format_results
+from .anomaly import AnomalyDetector
+from .formatter import ReportWriter, write_anomalies_json
 
 
 def parse_arguments():
@@ -23,7 +27,47 @@ def parse_arguments():
         type=str,
         help='Path to the input file with traffic data'
     )
-    return parser.parse_args()
+    parser.add_argument(
+        '--lenient',
+        action='store_true',
+        help='Skip malformed lines instead of aborting, and report error counts'
+    )
+    parser.add_argument(
+        '--quarantine',
+        type=str,
+        metavar='FILE',
+        help='Write rejected lines with line number and reason to FILE (lenient mode)'
+    )
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        metavar='N',
+        help='Abort once more than N lines have been rejected (lenient mode)'
+    )
+    parser.add_argument(
+        '--anomalies',
+        action='store_true',
+        help='Flag zero runs, spikes and missing half hours in the report'
+    )
+    parser.add_argument(
+        '--anomalies-json',
+        type=str,
+        metavar='FILE',
+        help='Also write flagged anomalies to FILE as JSON'
+    )
+    parser.add_argument(
+        '--sort-run-size',
+        type=int,
+        default=DEFAULT_RUN_SIZE,
+        metavar='N',
+        help='Records held in memory at once; larger inputs are spilled to '
+             f'temporary files (default: {DEFAULT_RUN_SIZE})'
+    )
+    args = parser.parse_args()
+    
+    if not args.lenient and (args.quarantine or args.max_errors is not None):
+        parser.error('--quarantine and --max-errors require --lenient')
+    return args
 
 
 def main():
@@ -38,21 +82,49 @@ def main():
             print(f"Error: File '{args.input_file}' not found.", file=sys.stderr)
             sys.exit(1)
             
-        # 1. Reading and parsing the input file
-        traffic_records = parse_traffic_file(input_path)
-        
-        # 2. Analyzing traffic data
-        analyzer = TrafficAnalyzer(traffic_records)
-        total_cars = analyzer.get_total_cars()
-        daily_totals = analyzer.get_daily_totals()
-        top_half_hours = analyzer.get_top_half_hours(3)
-        min_period = analyzer.get_min_contiguous_period(3)
+        # 1. Reading and parsing the input file into ordered, deduplicated
+        # records, sorting only if the single parse pass finds them out of order
+        quarantine_path = Path(args.quarantine) if args.quarantine else None
+        traffic_records, parse_summary = load_traffic_file(
+            input_path, args.lenient, quarantine_path, args.max_errors,
+            args.sort_run_size
+        )
+        if parse_summary.duplicates and not args.lenient:
+            print(
+                f"Warning: dropped {parse_summary.duplicates} records with "
+                "duplicate timestamps",
+                file=sys.stderr
+            )
         
-        # 3. Fomratting and outputting results
-        output = format_results(total_cars, daily_totals, top_half_hours, min_period)
-        print(output)
+        # Open the JSON output up front so a bad path fails before any output
+        anomalies_json = (
+            open(args.anomalies_json, 'w') if args.anomalies_json else nullcontext()
+        )
         
+        # 2. Analyzing traffic data and streaming each section as it is ready
+        analyzer = TrafficAnalyzer(traffic_records)
+        with anomalies_json as json_file, ReportWriter(sys.stdout) as writer:
+            writer.write_total_cars(analyzer.get_total_cars())
+            writer.write_daily_totals(analyzer.get_daily_totals())
+            writer.write_top_half_hours(analyzer.get_top_half_hours(3))
+            writer.write_min_period(analyzer.get_min_contiguous_period(3))
+            
+            if args.anomalies or args.anomalies_json:
+                anomalies = AnomalyDetector(traffic_records).detect()
+                if args.anomalies:
+                    writer.write_anomalies(anomalies)
+                if json_file is not None:
+                    write_anomalies_json(json_file, anomalies)
+            
+            if args.lenient:
+                writer.write_parse_summary(parse_summary)
         
+    except BrokenPipeError:
+        # Output was cut short by the reader (e.g. piped into `head`).
+        # Point stdout at devnull so the interpreter's final flush stays quiet.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
     except ValueError as e:
         print(f"Error: Invalid data format - {e}", file=sys.stderr)
         sys.exit(1)
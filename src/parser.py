@@ -1,36 +1,175 @@
 """Traffic data parser module."""
 
+from contextlib import nullcontext
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, ContextManager, Iterator, List, Optional, TextIO, Tuple
+
+from .sorting import DEFAULT_RUN_SIZE, MAX_CAR_COUNT, Records, external_sort
+
+
+# Called with (line_num, line, error) for every line that fails to parse
+ErrorHandler = Callable[[int, str, ValueError], None]
+
+
+@dataclass
+class ParseSummary:
+    """Counts of valid records, rejected lines and dropped duplicates from a parse."""
+
+    records: int = 0
+    errors: int = 0
+    duplicates: int = 0
+
+    @property
+    def lines(self) -> int:
+        """Number of non-empty lines processed."""
+        return self.records + self.errors
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of non-empty lines that were rejected."""
+        return self.errors / self.lines if self.lines else 0.0
+
+
+class ErrorQuarantine:
+    """
+    Error handler that records bad lines instead of aborting the parse.
+
+    Each rejected line is written to the quarantine stream (if any) as
+    tab-separated line number, reason and original text.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_errors: Optional[int] = None):
+        """
+        Initialize quarantine with an optional output stream and error limit.
+        """
+        self.stream = stream
+        self.max_errors = max_errors
+        self.errors = 0
+
+    def __call__(self, line_num: int, line: str, error: ValueError) -> None:
+        self.errors += 1
+        if self.stream is not None:
+            self.stream.write(f"{line_num}\t{error}\t{line}\n")
+
+        if self.max_errors is not None and self.errors > self.max_errors:
+            raise ValueError(
+                f"Too many invalid lines ({self.errors}), limit is {self.max_errors}; "
+                f"last at line {line_num}: {line}"
+            )
+
+
+def _raise_parse_error(line_num: int, line: str, error: ValueError) -> None:
+    """
+    Strict error handler: abort the parse on the first bad line.
+    """
+    # Preserve the original error message if it's about negative count
+    if "cannot be negative" in str(error):
+        raise error
+    raise ValueError(f"Invalid format at line {line_num}: {line}") from error
+
+
+def _iter_records(file: TextIO, on_error: ErrorHandler) -> Iterator[Tuple[datetime, int]]:
+    """
+    Yield (timestamp, car_count) tuples, passing bad lines to on_error.
+
+    Strict and lenient parsing share this loop, so a clean line costs the
+    same in both modes; the handler only runs for lines that fail.
+
+    Timestamps must be comparable, so the first record decides whether
+    every timestamp has a UTC offset or none do.
+    """
+    fromisoformat = datetime.fromisoformat
+    naive = None
+
+    for line_num, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            timestamp_str, count_str = line.split()
+            timestamp = fromisoformat(timestamp_str)
+            car_count = int(count_str)
+
+            if car_count < 0:
+                raise ValueError(f"Car count cannot be negative: {car_count}")
+            if car_count > MAX_CAR_COUNT:
+                raise ValueError(f"Car count too large: {car_count}")
+
+            if (timestamp.tzinfo is None) is not naive:
+                if naive is not None:
+                    raise ValueError(
+                        "Cannot mix timestamps with and without a UTC offset"
+                    )
+                naive = timestamp.tzinfo is None
+
+        except ValueError as e:
+            on_error(line_num, line, e)
+            continue
+
+        yield timestamp, car_count
+
+
+def _open_lenient(file_path: Path) -> TextIO:
+    """
+    Open the input so undecodable bytes reach the per-line error handler.
+
+    Bad bytes become lone surrogates, which fail to parse like any other
+    malformed line instead of aborting the whole run.
+    """
+    return open(file_path, 'r', errors='surrogateescape')
+
+
+def _open_quarantine(quarantine_path: Optional[Path]) -> ContextManager[Optional[TextIO]]:
+    """
+    Open the quarantine file for writing, or yield None when there is none.
+    """
+    if quarantine_path is None:
+        return nullcontext()
+    # Write undecodable input bytes back out unchanged
+    return open(quarantine_path, 'w', errors='surrogateescape')
 
 
 def parse_traffic_file(file_path: Path) -> List[Tuple[datetime, int]]:
     """
     Parse traffic file and return list of (timestamp, car_count) tuples.
     """
-    records = []
-    
     with open(file_path, 'r') as file:
-        for line_num, line in enumerate(file, start=1):
-            line = line.strip()
-            if not line:
-                continue
-                
-            try:
-                timestamp_str, count_str = line.split()
-                timestamp = datetime.fromisoformat(timestamp_str)
-                car_count = int(count_str)
-                
-                if car_count < 0:
-                    raise ValueError(f"Car count cannot be negative: {car_count}")
-                    
-                records.append((timestamp, car_count))
-                
-            except ValueError as e:
-                # Preserve the original error message if it's about negative count
-                if "cannot be negative" in str(e):
-                    raise
-                raise ValueError(f"Invalid format at line {line_num}: {line}") from e
-    
-    return records
\ No newline at end of file
+        return list(_iter_records(file, _raise_parse_error))
+
+
+def load_traffic_file(
+    file_path: Path,
+    lenient: bool = False,
+    quarantine_path: Optional[Path] = None,
+    max_errors: Optional[int] = None,
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[str] = None
+) -> Tuple[Records, ParseSummary]:
+    """
+    Parse traffic file in one pass into records ordered by timestamp.
+
+    Records go through external_sort, so duplicate timestamps keep their
+    first record and at most run_size records are held in memory; larger
+    inputs come back as a RecordFile streamed from disk.
+
+    Bad lines raise as in parse_traffic_file. With lenient they are skipped
+    instead: rejected lines are written to quarantine_path when given, and
+    ValueError is raised once more than max_errors lines have been rejected.
+    """
+    open_input = _open_lenient if lenient else open
+    with open_input(file_path) as file, _open_quarantine(quarantine_path) as quarantine_file:
+        quarantine = ErrorQuarantine(quarantine_file, max_errors)
+        on_error = quarantine if lenient else _raise_parse_error
+        records, duplicates = external_sort(
+            _iter_records(file, on_error), run_size, tmp_dir
+        )
+
+    summary = ParseSummary(
+        records=len(records) + duplicates,
+        errors=quarantine.errors,
+        duplicates=duplicates
+    )
+    return records, summary
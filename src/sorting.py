@@ -0,0 +1,206 @@
+"""External merge sort module."""
+
+import heapq
+import os
+import struct
+import tempfile
+import weakref
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from operator import itemgetter
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# Records held in memory at once while loading and sorting
+DEFAULT_RUN_SIZE = 500_000
+
+# Spilled records are (wall-clock microseconds since epoch, UTC offset in
+# microseconds, car count); naive timestamps store _NAIVE as their offset
+_RECORD = struct.Struct('<qqq')
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NAIVE = -2 ** 63
+
+# Largest car count a spilled record can hold
+MAX_CAR_COUNT = 2 ** 63 - 1
+
+# Records decoded per read when streaming spilled records back
+_READ_BATCH = 4096
+
+
+def is_sorted(records: Iterable[Tuple[datetime, int]]) -> bool:
+    """
+    Check in one pass that timestamps are strictly increasing.
+
+    Duplicate timestamps count as unsorted, since they need the merge sort
+    to be removed.
+    """
+    previous = None
+
+    for timestamp, _ in records:
+        if previous is not None and timestamp <= previous:
+            return False
+        previous = timestamp
+
+    return True
+
+
+def _dedupe(records: Iterable[Tuple[datetime, int]]) -> Iterator[Tuple[datetime, int]]:
+    """
+    Drop records whose timestamp repeats the previous one.
+    """
+    previous = None
+
+    for record in records:
+        if record[0] != previous:
+            previous = record[0]
+            yield record
+
+
+def _pack(record: Tuple[datetime, int]) -> bytes:
+    """
+    Encode a record for spilling, keeping its UTC offset if it has one.
+    """
+    timestamp, count = record
+    offset = timestamp.utcoffset()
+    if offset is None:
+        return _RECORD.pack((timestamp - _EPOCH) // _MICROSECOND, _NAIVE, count)
+    wall_clock = (timestamp.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+    return _RECORD.pack(wall_clock, offset // _MICROSECOND, count)
+
+
+class RecordFile:
+    """
+    Records spilled to a temporary binary file.
+
+    Each iteration streams the records back from disk, so a RecordFile can
+    be read any number of times without holding its records in memory. The
+    file is removed on close() or when the object is garbage collected.
+    """
+
+    def __init__(self, tmp_dir: Optional[str] = None):
+        """
+        Create an empty record file in tmp_dir (system default if None).
+        """
+        fd, self.path = tempfile.mkstemp(suffix='.records', dir=tmp_dir)
+        self._file = os.fdopen(fd, 'wb')
+        self._length = 0
+        self._finalizer = weakref.finalize(self, _remove_file, self._file, self.path)
+
+    def __enter__(self) -> 'RecordFile':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Tuple[datetime, int]]:
+        epoch = _EPOCH
+
+        with open(self.path, 'rb') as file:
+            while True:
+                block = file.read(_RECORD.size * _READ_BATCH)
+                if not block:
+                    return
+                for wall_clock, offset, count in _RECORD.iter_unpack(block):
+                    # Positional timedelta(days, seconds, microseconds) is cheaper
+                    timestamp = epoch + timedelta(0, 0, wall_clock)
+                    if offset != _NAIVE:
+                        timestamp = timestamp.replace(
+                            tzinfo=timezone(timedelta(0, 0, offset))
+                        )
+                    yield timestamp, count
+
+    def extend(self, records: Iterable[Tuple[datetime, int]]) -> None:
+        """
+        Append records to the end of the file.
+        """
+        self._file.writelines(map(_pack, records))
+        self._file.flush()
+        self._length = self._file.tell() // _RECORD.size
+
+    def close(self) -> None:
+        """
+        Delete the underlying file.
+        """
+        self._finalizer()
+
+
+def _remove_file(file: BinaryIO, path: str) -> None:
+    file.close()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# Result of external_sort: an in-memory list or records spilled to disk
+Records = Union[List[Tuple[datetime, int]], RecordFile]
+
+
+def external_sort(
+    records: Iterable[Tuple[datetime, int]],
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmp_dir: Optional[str] = None
+) -> Tuple[Records, int]:
+    """
+    Order records by timestamp and drop duplicate timestamps in one pass.
+
+    Returns the ordered records and the number of duplicates dropped. When
+    a timestamp repeats, the record that came first in the input is kept.
+
+    Records are read run_size at a time and checked for order as they
+    arrive. Input that fits in one run is returned as a list. Larger input
+    is spilled to disk and returned as a RecordFile: while the input stays
+    in order it is appended to a single file, otherwise each run is sorted,
+    spilled to its own file and the runs are k-way merged. At most one run
+    is held in memory, so the input may be larger than RAM.
+    """
+    if run_size < 1:
+        raise ValueError(f"Run size must be positive: {run_size}")
+
+    records = iter(records)
+    records_read = 0
+    in_order = True
+    previous = None
+    runs: List[RecordFile] = []
+
+    try:
+        while True:
+            run = list(islice(records, run_size))
+            records_read += len(run)
+
+            if run and in_order:
+                in_order = (previous is None or previous < run[0][0]) and is_sorted(run)
+                previous = run[-1][0]
+            if not in_order:
+                # Stable sort keeps input order among equal timestamps
+                run.sort(key=itemgetter(0))
+
+            if len(run) < run_size and not runs:
+                # Everything fit in a single run, no need to touch the disk
+                result = run if in_order else list(_dedupe(run))
+                return result, records_read - len(result)
+
+            if run:
+                if not (in_order and runs):
+                    runs.append(RecordFile(tmp_dir))
+                runs[-1].extend(run)
+            last_run = len(run) < run_size
+            # Release this run before the next one is read
+            run = None
+            if last_run:
+                break
+
+        if in_order:
+            result = runs.pop()
+        else:
+            # heapq.merge breaks ties by run order, so earlier records still win
+            result = RecordFile(tmp_dir)
+            result.extend(_dedupe(heapq.merge(*runs, key=itemgetter(0))))
+        return result, records_read - len(result)
+    finally:
+        for run_file in runs:
+            run_file.close()
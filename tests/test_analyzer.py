@@ -3,6 +3,7 @@
 import unittest
 from datetime import datetime
 from src.analyzer import TrafficAnalyzer
+from src.sorting import RecordFile
 
 
 class TestTrafficAnalyzer(unittest.TestCase):
@@ -111,6 +112,24 @@ class TestTrafficAnalyzer(unittest.TestCase):
         
         self.assertEqual(len(min_period), 3)
         self.assertEqual(total, 18)
+    
+    def test_analyzer_streams_record_file(self):
+        """Test that results from disk-backed records match the list."""
+        expected = TrafficAnalyzer(self.sample_records)
+        
+        with RecordFile() as record_file:
+            record_file.extend(self.sample_records)
+            analyzer = TrafficAnalyzer(record_file)
+            
+            self.assertEqual(analyzer.get_total_cars(), expected.get_total_cars())
+            self.assertEqual(analyzer.get_daily_totals(), expected.get_daily_totals())
+            self.assertEqual(
+                analyzer.get_top_half_hours(3), expected.get_top_half_hours(3)
+            )
+            self.assertEqual(
+                analyzer.get_min_contiguous_period(3),
+                expected.get_min_contiguous_period(3)
+            )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,118 @@
+"""Unit tests for anomaly module."""
+
+import unittest
+from datetime import datetime
+from src.anomaly import Anomaly, AnomalyDetector
+
+
+class TestAnomalyDetector(unittest.TestCase):
+    """Test cases for anomaly detector."""
+
+    def test_find_zero_runs(self):
+        """Test that long runs of zeros are flagged."""
+        records = [
+            (datetime(2021, 12, 1, 5, 0, 0), 5),
+            (datetime(2021, 12, 1, 5, 30, 0), 0),
+            (datetime(2021, 12, 1, 6, 0, 0), 0),
+            (datetime(2021, 12, 1, 6, 30, 0), 0),
+            (datetime(2021, 12, 1, 7, 0, 0), 12),
+            (datetime(2021, 12, 1, 7, 30, 0), 0),
+        ]
+        detector = AnomalyDetector(records)
+        runs = detector.find_zero_runs(3)
+
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0].kind, 'zero_run')
+        self.assertEqual(runs[0].start, datetime(2021, 12, 1, 5, 30, 0))
+        self.assertEqual(runs[0].end, datetime(2021, 12, 1, 6, 30, 0))
+
+    def test_find_zero_runs_broken_by_gap(self):
+        """Test that zeros separated by missing slots are not one run."""
+        records = [
+            (datetime(2021, 12, 1, 5, 0, 0), 0),
+            (datetime(2021, 12, 1, 5, 30, 0), 0),
+            (datetime(2021, 12, 1, 7, 0, 0), 0),
+            (datetime(2021, 12, 1, 7, 30, 0), 0),
+        ]
+        detector = AnomalyDetector(records)
+
+        self.assertEqual(detector.find_zero_runs(3), [])
+        self.assertEqual(len(detector.find_zero_runs(2)), 2)
+
+    def test_find_spikes(self):
+        """Test that a count far above the same slot's history is flagged."""
+        counts = [10, 11, 10, 12, 40, 11]
+        records = [
+            (datetime(2021, 12, day, 8, 0, 0), count)
+            for day, count in enumerate(counts, start=1)
+        ]
+        detector = AnomalyDetector(records)
+        spikes = detector.find_spikes(window=7, threshold=3.0, min_history=3)
+
+        self.assertEqual(len(spikes), 1)
+        self.assertEqual(spikes[0].start, datetime(2021, 12, 5, 8, 0, 0))
+        self.assertIn('40 cars', spikes[0].detail)
+
+    def test_find_spikes_needs_history(self):
+        """Test that no spike is flagged before enough history exists."""
+        records = [
+            (datetime(2021, 12, 1, 8, 0, 0), 1),
+            (datetime(2021, 12, 2, 8, 0, 0), 100),
+        ]
+        detector = AnomalyDetector(records)
+
+        self.assertEqual(detector.find_spikes(min_history=3), [])
+
+    def test_find_spikes_flat_history(self):
+        """Test that a constant series never produces a spike."""
+        records = [
+            (datetime(2021, 12, day, 8, 0, 0), 7) for day in range(1, 11)
+        ]
+        detector = AnomalyDetector(records)
+
+        self.assertEqual(detector.find_spikes(window=2, min_history=2), [])
+
+    def test_find_spikes_invalid_parameters(self):
+        """Test that unusable window settings are rejected."""
+        detector = AnomalyDetector([(datetime(2021, 12, 1, 8, 0, 0), 7)])
+
+        with self.assertRaises(ValueError):
+            detector.find_spikes(min_history=1)
+        with self.assertRaises(ValueError):
+            detector.find_spikes(window=2, min_history=3)
+
+    def test_find_gaps(self):
+        """Test that missing half hours are reported as an interval."""
+        records = [
+            (datetime(2021, 12, 1, 6, 0, 0), 14),
+            (datetime(2021, 12, 1, 5, 0, 0), 5),  # Out of order input
+            (datetime(2021, 12, 1, 6, 30, 0), 15),
+        ]
+        detector = AnomalyDetector(records)
+        gaps = detector.find_gaps()
+
+        self.assertEqual(gaps, [
+            Anomaly(
+                'gap',
+                datetime(2021, 12, 1, 5, 30, 0),
+                datetime(2021, 12, 1, 5, 30, 0),
+                'missing half hours: 1'
+            )
+        ])
+
+    def test_detect_sorted_by_start(self):
+        """Test that detect combines all checks ordered by start time."""
+        records = [
+            (datetime(2021, 12, 1, 5, 0, 0), 0),
+            (datetime(2021, 12, 1, 5, 30, 0), 0),
+            (datetime(2021, 12, 1, 6, 0, 0), 0),
+            (datetime(2021, 12, 1, 8, 0, 0), 3),
+        ]
+        anomalies = AnomalyDetector(records).detect()
+
+        self.assertEqual([a.kind for a in anomalies], ['zero_run', 'gap'])
+        self.assertEqual(anomalies[1].to_dict()['start'], '2021-12-01T06:30:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
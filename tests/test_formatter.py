@@ -1,8 +1,14 @@
 """Unit tests for formatter module."""
 
+import io
+import json
 import unittest
 from datetime import datetime
-from src.formatter import format_results
+from src.anomaly import Anomaly
+from src.formatter import (
+    format_results, write_results, write_anomalies_json, ReportWriter
+)
+from src.parser import ParseSummary
 
 
 class TestFormatter(unittest.TestCase):
@@ -110,6 +116,140 @@ class TestFormatter(unittest.TestCase):
         # Count sections (should have 4 main sections)
         section_count = output.count('=' * 60)
         self.assertEqual(section_count, 8)  # 8 separator lines (2 per section)
+    
+    def test_write_results_matches_format_results(self):
+        """Test that the streaming writer produces the same layout."""
+        daily_totals = {'2021-12-01': 30, '2021-12-02': 20}
+        top_half_hours = [(datetime(2021, 12, 1, 8, 0, 0), 25)]
+        min_period = ([(datetime(2021, 12, 1, 15, 0, 0), 10)], 10)
+        
+        stream = io.StringIO()
+        write_results(stream, 50, daily_totals, top_half_hours, min_period)
+        expected = format_results(50, daily_totals, top_half_hours, min_period)
+        
+        self.assertEqual(stream.getvalue(), expected + '\n')
+    
+    def test_report_writer_buffers_writes(self):
+        """Test that lines are written to the stream in large chunks."""
+        class RecordingStream(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.write_calls = 0
+            
+            def write(self, text):
+                self.write_calls += 1
+                return super().write(text)
+        
+        stream = RecordingStream()
+        daily_totals = {f'2021-12-{day:02d}': day for day in range(1, 29)}
+        
+        with ReportWriter(stream, buffer_size=100) as writer:
+            writer.write_daily_totals(daily_totals)
+            # Each line is 14 bytes, so nothing reaches the stream per line
+            self.assertLess(stream.write_calls, len(daily_totals))
+        
+        self.assertIn('2021-12-28 28\n', stream.getvalue())
+        self.assertTrue(stream.getvalue().endswith('\n\n'))
+    
+    def test_format_parse_summary(self):
+        """Test that the parse errors section is appended when given."""
+        daily_totals = {'2021-12-01': 50}
+        top_half_hours = [(datetime(2021, 12, 1, 8, 0, 0), 25)]
+        min_period = ([(datetime(2021, 12, 1, 15, 0, 0), 10)], 10)
+        
+        plain = format_results(50, daily_totals, top_half_hours, min_period)
+        output = format_results(
+            50, daily_totals, top_half_hours, min_period,
+            ParseSummary(records=3, errors=1, duplicates=2)
+        )
+        
+        self.assertNotIn('PARSE ERRORS', plain)
+        self.assertTrue(output.startswith(plain))
+        self.assertIn('PARSE ERRORS', output)
+        self.assertIn('Valid records: 3', output)
+        self.assertIn('Invalid lines: 1', output)
+        self.assertIn('Error rate: 25.00%', output)
+        self.assertIn('Duplicate timestamps dropped: 2', output)
+    
+    def test_format_anomalies(self):
+        """Test anomalies in the report and as JSON."""
+        daily_totals = {'2021-12-01': 50}
+        top_half_hours = [(datetime(2021, 12, 1, 8, 0, 0), 25)]
+        min_period = ([(datetime(2021, 12, 1, 15, 0, 0), 10)], 10)
+        anomalies = [
+            Anomaly(
+                'gap',
+                datetime(2021, 12, 1, 8, 30, 0),
+                datetime(2021, 12, 1, 9, 0, 0),
+                'missing half hours: 2'
+            )
+        ]
+        
+        output = format_results(
+            50, daily_totals, top_half_hours, min_period, anomalies=anomalies
+        )
+        empty = format_results(
+            50, daily_totals, top_half_hours, min_period, anomalies=[]
+        )
+        
+        self.assertIn('ANOMALIES', output)
+        self.assertIn(
+            'gap 2021-12-01T08:30:00 2021-12-01T09:00:00 missing half hours: 2',
+            output
+        )
+        self.assertIn('None detected', empty)
+        
+        stream = io.StringIO()
+        write_anomalies_json(stream, anomalies)
+        self.assertEqual(json.loads(stream.getvalue()), [{
+            'kind': 'gap',
+            'start': '2021-12-01T08:30:00',
+            'end': '2021-12-01T09:00:00',
+            'detail': 'missing half hours: 2',
+        }])
+    
+    def test_report_writer_flushes_sections_before_error(self):
+        """Test that finished sections are written when a later one fails."""
+        stream = io.StringIO()
+        
+        with self.assertRaises(ValueError):
+            with ReportWriter(stream) as writer:
+                writer.write_total_cars(42)
+                raise ValueError("Not enough records")
+        
+        self.assertIn('TOTAL CARS', stream.getvalue())
+        self.assertIn('42\n', stream.getvalue())
+    
+    def test_report_writer_flushes_sections_before_other_os_error(self):
+        """Test that an OSError not raised by the stream still flushes."""
+        stream = io.StringIO()
+        
+        with self.assertRaises(FileNotFoundError):
+            with ReportWriter(stream) as writer:
+                writer.write_total_cars(42)
+                open('/nonexistent/report.json', 'w')
+        
+        self.assertIn('TOTAL CARS', stream.getvalue())
+    
+    def test_report_writer_no_flush_after_write_error(self):
+        """Test that nothing more is written once the stream has failed."""
+        class ClosedPipe(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.write_calls = 0
+            
+            def write(self, text):
+                self.write_calls += 1
+                raise BrokenPipeError()
+        
+        stream = ClosedPipe()
+        
+        with self.assertRaises(BrokenPipeError):
+            with ReportWriter(stream, buffer_size=10) as writer:
+                writer.write_total_cars(42)
+        
+        # Only the write that filled the buffer was attempted
+        self.assertEqual(stream.write_calls, 1)
 
 
 if __name__ == '__main__':
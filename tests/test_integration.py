@@ -1,7 +1,9 @@
 """Integration tests for traffic counter application."""
 
+import subprocess
+import sys
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
@@ -152,6 +154,85 @@ class TestIntegration(unittest.TestCase):
             
         finally:
             temp_path.unlink()
+    
+    def test_unordered_input_with_small_memory_budget(self):
+        """Test that spilled, shuffled input gives the same report."""
+        start = datetime(2021, 12, 1, 5, 0, 0)
+        lines = [
+            f"{(start + timedelta(minutes=30 * i)).isoformat()} {(i * 7) % 23}"
+            for i in range(200)
+        ]
+        shuffled = lines[::2] + lines[1::2] + lines[:5]  # Out of order, duplicates
+        
+        paths = []
+        try:
+            for content in (lines, shuffled):
+                with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+                    f.write('\n'.join(content))
+                    paths.append(Path(f.name))
+            
+            outputs = [
+                subprocess.run(
+                    [sys.executable, '-m', 'src.main', '--sort-run-size', '16', str(path)],
+                    capture_output=True,
+                    text=True,
+                    cwd=Path(__file__).resolve().parent.parent
+                )
+                for path in paths
+            ]
+            
+            self.assertEqual(outputs[0].returncode, 0)
+            self.assertEqual(outputs[1].stdout, outputs[0].stdout)
+            self.assertIn('dropped 5 records', outputs[1].stderr)
+        finally:
+            for path in paths:
+                path.unlink()
+    
+    def test_unwritable_anomalies_json(self):
+        """Test that a bad JSON path fails before any report is written."""
+        fixture = Path(__file__).resolve().parent / 'fixtures' / 'sample_input.txt'
+        result = subprocess.run(
+            [
+                sys.executable, '-m', 'src.main',
+                '--anomalies-json', '/nonexistent/anomalies.json', str(fixture)
+            ],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(result.stdout, '')
+        self.assertIn('anomalies.json', result.stderr)
+    
+    def test_output_piped_into_closed_reader(self):
+        """Test that a reader closing the pipe early causes no traceback."""
+        # Enough days for the report to overflow the OS pipe buffer
+        start = datetime(2000, 1, 1)
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            for i in range(300000):
+                f.write(f"{(start + timedelta(minutes=30 * i)).isoformat()} {i % 50}\n")
+            temp_path = Path(f.name)
+        
+        try:
+            process = subprocess.Popen(
+                [sys.executable, '-m', 'src.main', str(temp_path)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=Path(__file__).resolve().parent.parent
+            )
+            # Read only the first line, like `head -1`, then hang up
+            first_line = process.stdout.readline()
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.stderr.close()
+            process.wait()
+            
+            self.assertEqual(first_line.strip(), b'=' * 60)
+            self.assertNotIn(b'Traceback', stderr)
+            self.assertNotIn(b'Broken pipe', stderr)
+        finally:
+            temp_path.unlink()
 
 
 if __name__ == '__main__':
@@ -4,7 +4,7 @@ import unittest
 from datetime import datetime
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from src.parser import parse_traffic_file
+from src.parser import load_traffic_file, parse_traffic_file
 
 
 class TestParser(unittest.TestCase):
@@ -111,6 +111,189 @@ class TestParser(unittest.TestCase):
                 parse_traffic_file(temp_path)
         finally:
             temp_path.unlink()
+    
+    def test_parse_count_too_large(self):
+        """Test that a count too large to store is a parse error."""
+        content = f"2021-12-01T05:00:00 {2 ** 63}"
+        
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        
+        try:
+            with self.assertRaises(ValueError) as context:
+                parse_traffic_file(temp_path)
+            self.assertIn("Invalid format at line 1", str(context.exception))
+        finally:
+            temp_path.unlink()
+    
+    def test_parse_mixed_utc_offsets(self):
+        """Test that mixing naive and offset timestamps is rejected per line."""
+        content = """2021-12-01T05:00:00 5
+2021-12-01T05:30:00+10:00 12
+2021-12-01T06:00:00 14"""
+        
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        
+        try:
+            with self.assertRaises(ValueError) as context:
+                parse_traffic_file(temp_path)
+            self.assertIn("Invalid format at line 2", str(context.exception))
+            
+            records, summary = load_traffic_file(temp_path, lenient=True)
+            self.assertEqual([count for _, count in records], [5, 14])
+            self.assertEqual(summary.errors, 1)
+        finally:
+            temp_path.unlink()
+    
+    def test_parse_lenient_skips_bad_lines(self):
+        """Test lenient parsing keeps valid records and counts bad lines."""
+        content = """2021-12-01T05:00:00 5
+invalid line
+2021-12-01T05:30:00 -3
+2021-12-01T06:00:00 14"""
+        
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        
+        try:
+            records, summary = load_traffic_file(temp_path, lenient=True)
+            
+            self.assertEqual([count for _, count in records], [5, 14])
+            self.assertEqual(summary.records, 2)
+            self.assertEqual(summary.errors, 2)
+            self.assertEqual(summary.error_rate, 0.5)
+        finally:
+            temp_path.unlink()
+    
+    def test_parse_lenient_writes_quarantine(self):
+        """Test rejected lines are quarantined with line number and reason."""
+        content = """2021-12-01T05:00:00 5
+
+2021-12-01T05:30:00 -3"""
+        
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        quarantine_path = temp_path.with_suffix('.quarantine')
+        
+        try:
+            load_traffic_file(
+                temp_path, lenient=True, quarantine_path=quarantine_path
+            )
+            
+            lines = quarantine_path.read_text().splitlines()
+            self.assertEqual(len(lines), 1)
+            line_num, reason, line = lines[0].split('\t')
+            self.assertEqual(line_num, '3')
+            self.assertIn("cannot be negative", reason)
+            self.assertEqual(line, "2021-12-01T05:30:00 -3")
+        finally:
+            temp_path.unlink()
+            quarantine_path.unlink()
+    
+    def test_parse_lenient_undecodable_line(self):
+        """Test that a line with invalid UTF-8 is quarantined, not fatal."""
+        content = b"2021-12-01T05:00:00 5\n\xff\xfe garbage\n2021-12-01T05:30:00 12\n"
+        
+        with NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        quarantine_path = temp_path.with_suffix('.quarantine')
+        
+        try:
+            records, summary = load_traffic_file(
+                temp_path, lenient=True, quarantine_path=quarantine_path
+            )
+            
+            self.assertEqual([count for _, count in records], [5, 12])
+            self.assertEqual(summary.errors, 1)
+            quarantined = quarantine_path.read_bytes()
+            self.assertTrue(quarantined.startswith(b'2\t'))
+            self.assertTrue(quarantined.endswith(b'\t\xff\xfe garbage\n'))
+        finally:
+            temp_path.unlink()
+            quarantine_path.unlink()
+    
+    def test_parse_lenient_max_errors(self):
+        """Test lenient parsing aborts once the error limit is exceeded."""
+        content = """bad
+2021-12-01T05:00:00 5
+worse"""
+        
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        
+        try:
+            records, summary = load_traffic_file(temp_path, lenient=True, max_errors=2)
+            self.assertEqual(summary.errors, 2)
+            
+            with self.assertRaises(ValueError) as context:
+                load_traffic_file(temp_path, lenient=True, max_errors=1)
+            self.assertIn("Too many invalid lines", str(context.exception))
+        finally:
+            temp_path.unlink()
+    
+    def test_load_out_of_order_file(self):
+        """Test loading unordered input with a duplicate timestamp."""
+        content = """2021-12-01T06:00:00 14
+2021-12-01T05:00:00 5
+2021-12-01T05:30:00 12
+2021-12-01T05:00:00 7"""
+        
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        
+        try:
+            for run_size in (2, 100):
+                records, summary = load_traffic_file(temp_path, run_size=run_size)
+                self.assertEqual(list(records), [
+                    (datetime(2021, 12, 1, 5, 0, 0), 5),
+                    (datetime(2021, 12, 1, 5, 30, 0), 12),
+                    (datetime(2021, 12, 1, 6, 0, 0), 14),
+                ])
+                # Valid lines are counted before duplicates are dropped
+                self.assertEqual(summary.records, 4)
+                self.assertEqual(summary.duplicates, 1)
+        finally:
+            temp_path.unlink()
+    
+    def test_load_lenient_error_rate(self):
+        """Test error rate uses all valid lines, including duplicates."""
+        content = """2021-12-01T05:00:00 5
+invalid line
+2021-12-01T05:00:00 5
+2021-12-01T05:30:00 12"""
+        
+        with NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            temp_path = Path(f.name)
+        
+        try:
+            records, summary = load_traffic_file(temp_path, lenient=True)
+            self.assertEqual(len(records), 2)
+            self.assertEqual(summary.records, 3)
+            self.assertEqual(summary.errors, 1)
+            self.assertEqual(summary.duplicates, 1)
+            self.assertEqual(summary.error_rate, 0.25)
+            
+            with self.assertRaises(ValueError):
+                load_traffic_file(temp_path)
+        finally:
+            temp_path.unlink()
 
 
 if __name__ == '__main__':
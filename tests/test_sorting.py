@@ -0,0 +1,139 @@
+"""Unit tests for sorting module."""
+
+import random
+import tracemalloc
+import unittest
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from src.sorting import RecordFile, external_sort, is_sorted
+
+
+class TestSorting(unittest.TestCase):
+    """Test cases for sortedness check and external merge sort."""
+
+    def setUp(self):
+        """Set up test data."""
+        start = datetime(2021, 12, 1, 5, 0, 0)
+        self.sorted_records = [
+            (start + timedelta(minutes=30 * i), i % 7) for i in range(100)
+        ]
+
+    def test_is_sorted(self):
+        """Test sortedness check on ordered and unordered records."""
+        self.assertTrue(is_sorted(self.sorted_records))
+        self.assertTrue(is_sorted([]))
+        self.assertFalse(is_sorted(list(reversed(self.sorted_records))))
+
+    def test_is_sorted_duplicates(self):
+        """Test that repeated timestamps count as unsorted."""
+        records = self.sorted_records[:3] + [self.sorted_records[2]]
+        self.assertFalse(is_sorted(records))
+
+    def test_external_sort_single_run(self):
+        """Test sorting input that fits in one run."""
+        shuffled = self.sorted_records[:]
+        random.Random(1).shuffle(shuffled)
+
+        result, duplicates = external_sort(shuffled, run_size=1000)
+        self.assertIsInstance(result, list)
+        self.assertEqual(result, self.sorted_records)
+        self.assertEqual(duplicates, 0)
+
+    def test_external_sort_spills_runs(self):
+        """Test that merging spilled runs gives the fully sorted series."""
+        shuffled = self.sorted_records[:]
+        random.Random(2).shuffle(shuffled)
+
+        result, _ = external_sort(shuffled, run_size=7)
+        with result:
+            self.assertIsInstance(result, RecordFile)
+            self.assertEqual(len(result), len(self.sorted_records))
+            self.assertEqual(list(result), self.sorted_records)
+            # Each pass streams the records from disk again
+            self.assertEqual(list(result), self.sorted_records)
+
+    def test_external_sort_ordered_input(self):
+        """Test that input already in order is spilled without reordering."""
+        result, duplicates = external_sort(self.sorted_records, run_size=10)
+        with result:
+            self.assertEqual(list(result), self.sorted_records)
+            self.assertEqual(duplicates, 0)
+
+    def test_external_sort_removes_duplicates(self):
+        """Test that the first record for a repeated timestamp is kept."""
+        timestamp = datetime(2021, 12, 1, 5, 0, 0)
+        records = [
+            (timestamp + timedelta(minutes=30), 3),
+            (timestamp, 10),
+            (timestamp + timedelta(minutes=60), 4),
+            (timestamp, 99),
+        ]
+
+        for run_size in (1, 2, 10):
+            result, duplicates = external_sort(records, run_size=run_size)
+            self.assertEqual(duplicates, 1)
+            self.assertEqual(list(result), [
+                (timestamp, 10),
+                (timestamp + timedelta(minutes=30), 3),
+                (timestamp + timedelta(minutes=60), 4),
+            ])
+
+    def test_external_sort_spills_aware_timestamps(self):
+        """Test that UTC offsets survive a round trip through spilled runs."""
+        start = datetime(2021, 12, 1, 5, 0, 0, tzinfo=timezone(timedelta(hours=10)))
+        records = [
+            (start + timedelta(minutes=30 * i), i) for i in range(10)
+        ]
+        shuffled = records[:]
+        random.Random(3).shuffle(shuffled)
+
+        result, _ = external_sort(shuffled, run_size=3)
+        result = list(result)
+        self.assertEqual(result, records)
+        self.assertTrue(all(
+            timestamp.utcoffset() == timedelta(hours=10) for timestamp, _ in result
+        ))
+
+    def test_external_sort_invalid_run_size(self):
+        """Test that a non-positive run size is rejected."""
+        with self.assertRaises(ValueError):
+            external_sort(self.sorted_records, run_size=0)
+
+    def test_external_sort_holds_one_run_in_memory(self):
+        """Test that peak memory while spilling stays near a single run."""
+        def generate(n):
+            start = datetime(2000, 1, 1)
+            for i in range(n):
+                yield start + timedelta(minutes=30 * i), i % 50
+
+        def traced_peak(function):
+            tracemalloc.start()
+            try:
+                value = function()
+                return value, tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        run_size = 20000
+        _, one_run = traced_peak(lambda: list(islice(generate(run_size), run_size)))
+        (result, _), peak = traced_peak(
+            lambda: external_sort(generate(run_size * 4), run_size=run_size)
+        )
+
+        with result:
+            self.assertEqual(len(result), run_size * 4)
+        self.assertLess(peak, one_run * 1.5)
+
+    def test_record_file_removed_on_close(self):
+        """Test that closing a record file deletes it from disk."""
+        record_file = RecordFile()
+        record_file.extend(self.sorted_records[:3])
+        self.assertEqual(list(record_file), self.sorted_records[:3])
+
+        record_file.close()
+        with self.assertRaises(FileNotFoundError):
+            list(record_file)
+
+
+if __name__ == '__main__':
+    unittest.main()